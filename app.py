@@ -3,13 +3,20 @@ import os
 import tempfile
 import secrets
 from datetime import datetime
-import PyPDF2
-from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM, AutoModelForCausalLM, AutoTokenizer
+from transformers import pipeline, AutoModelForCausalLM
 import torch
 from cryptography.fernet import Fernet
 import logging
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+import config
+from summarization import extract_text_from_pdf, summarize_document
+from assisted_decoding import load_draft_model, assisted_generation_kwargs
+from inference_pool import InferenceWorkerPool
+from model_cache import load_with_fallback
+from text_stats import compute_text_stats, compute_summary_stats
+from semantic_sections import EmbeddingCache, SentenceEncoder, group_sentences
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -38,6 +45,12 @@ if 'current_filename' not in st.session_state:
     st.session_state.current_filename = None
 if 'current_word_count' not in st.session_state:
     st.session_state.current_word_count = 0
+if 'current_stats' not in st.session_state:
+    st.session_state.current_stats = None
+if 'embedding_stats' not in st.session_state:
+    st.session_state.embedding_stats = None
+if 'draft_model' not in st.session_state:
+    st.session_state.draft_model = None
 
 # Initialize encryption
 ENCRYPTION_KEY = os.environ.get('ENCRYPTION_KEY', Fernet.generate_key())
@@ -47,16 +60,17 @@ def load_summarization_model():
     """Load a reliable model for comprehensive summarization"""
     try:
         with st.spinner("Loading AI model... This may take a few minutes on first run."):
-            # Use a reliable model that works well for business documents
-            model_name = "sshleifer/distilbart-cnn-12-6"  # Fast and reliable
+            # Try the default model first, then the configured fallbacks
+            model_names = [config.DEFAULT_MODEL] + config.FALLBACK_MODELS
             
             device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
             
             try:
-                st.info(f"Loading {model_name}...")
-                tokenizer = AutoTokenizer.from_pretrained(model_name)
-                model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
-                model.to(device)
+                st.info(f"Loading {model_names[0]}...")
+                model_name, tokenizer, model, attempts = load_with_fallback(model_names, device)
+                for attempt in attempts:
+                    if attempt["error"]:
+                        st.warning(f"⚠️ Failed to load {attempt['model']}: {attempt['error']}")
                 
                 summarizer = pipeline("summarization", model=model, tokenizer=tokenizer, device=device)
                 
@@ -64,11 +78,22 @@ def load_summarization_model():
                 st.session_state.model_loaded = True
                 st.session_state.model_name = model_name
                 
-                st.success(f"✅ Model {model_name} loaded successfully on {device}")
+                st.success(f"✅ Model {model_name} loaded successfully on {device} in {attempts[-1]['seconds']:.1f}s")
+                
+                # Optional draft model for assisted decoding
+                if config.ASSISTED_DECODING_ENABLED:
+                    try:
+                        st.info(f"Loading draft model {config.DRAFT_MODEL}...")
+                        st.session_state.draft_model = load_draft_model(config.DRAFT_MODEL, model, device)
+                        st.success(f"✅ Assisted decoding enabled with {config.DRAFT_MODEL} (greedy decoding instead of beam search)")
+                    except Exception as e:
+                        st.session_state.draft_model = None
+                        st.warning(f"⚠️ Draft model unavailable, using standard decoding: {str(e)}")
+                        logger.warning(f"Failed to load draft model {config.DRAFT_MODEL}: {str(e)}")
                 return True
                 
             except Exception as e:
-                st.error(f"Failed to load {model_name}: {str(e)}")
+                st.error(f"Failed to load a summarization model: {str(e)}")
                 return False
             
     except Exception as e:
@@ -76,171 +101,74 @@ def load_summarization_model():
         logger.error(f"Error loading model: {str(e)}")
         return False
 
-def extract_text_from_pdf(pdf_file):
-    """Extract text from PDF file with better formatting"""
-    try:
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        
-        for page_num, page in enumerate(pdf_reader.pages, 1):
-            page_text = page.extract_text()
-            if page_text.strip():
-                text += f"\n--- Page {page_num} ---\n{page_text}\n"
-        
-        return text.strip()
-    
-    except Exception as e:
-        logger.error(f"Error extracting text from PDF: {str(e)}")
-        return None
+def get_generation_kwargs() -> Dict:
+    """Extra generation arguments for the summarizer pipeline"""
+    return assisted_generation_kwargs(st.session_state.draft_model)
 
-def chunk_text(text, max_length=1024):
-    """Split text into chunks suitable for summarization with better error handling"""
-    try:
-        words = text.split()
-        if len(words) == 0:
-            return []
-            
-        chunks = []
-        current_chunk = []
-        current_length = 0
-        
-        for word in words:
-            if current_length + len(word) + 1 <= max_length:
-                current_chunk.append(word)
-                current_length += len(word) + 1
-            else:
-                if current_chunk:
-                    chunks.append(" ".join(current_chunk))
-                current_chunk = [word]
-                current_length = len(word)
-        
-        if current_chunk:
-            chunks.append(" ".join(current_chunk))
-        
-        # Ensure we have at least one chunk
-        if not chunks:
-            chunks = [text[:max_length]]
-        
-        return chunks
-        
-    except Exception as e:
-        logger.error(f"Error in chunk_text: {str(e)}")
-        # Fallback: return the original text as a single chunk
-        return [text[:max_length]] if text else [""]
+def run_summarizer(text: str, max_length: int, min_length: int) -> str:
+    """Summarize one piece of text with the in-process model"""
+    summary = st.session_state.summarizer(
+        text,
+        max_length=max_length,
+        min_length=min_length,
+        do_sample=False,
+        **get_generation_kwargs()
+    )
+    return summary[0]['summary_text']
 
-def simple_fallback_summary(text: str) -> str:
-    """Simple fallback summarization when model fails"""
-    try:
-        sentences = text.split('. ')
-        if len(sentences) <= 3:
-            return text
-        
-        # Take first few sentences and last sentence
-        summary_sentences = sentences[:3]
-        if len(sentences) > 4:
-            summary_sentences.append(sentences[-1])
-        
-        return '. '.join(summary_sentences) + '.'
-    except:
-        return text[:500] + "..." if len(text) > 500 else text
+@st.cache_resource(show_spinner="Starting inference workers...")
+def get_inference_pool(model_name: str, draft_model_name: Optional[str] = None):
+    """Start the inference worker pool shared by all sessions using the same models"""
+    pool = InferenceWorkerPool(
+        model_name=model_name,
+        num_workers=config.MAX_CONCURRENT_PROCESSES,
+        threads_per_worker=config.INFERENCE_THREADS_PER_WORKER,
+        pin_cpus=config.PIN_WORKER_CPUS,
+        draft_model_name=draft_model_name,
+        timeout=config.INFERENCE_TIMEOUT
+    )
+    pool.start()
+    return pool
+
+@st.cache_resource(show_spinner="Loading sentence embedding model...")
+def get_sentence_encoder():
+    """Load the sentence encoder and embedding cache shared by all sessions"""
+    cache = EmbeddingCache(config.EMBEDDING_CACHE_PATH)
+    return SentenceEncoder(config.EMBEDDING_MODEL, cache, batch_size=config.EMBEDDING_BATCH_SIZE)
 
-def create_structured_summary(text: str) -> Dict:
+def create_structured_summary(text: str, word_count: Optional[int] = None) -> Dict:
     """Create a structured, comprehensive summary with sections"""
-    try:
-        if not st.session_state.summarizer:
-            return {"error": "Model not loaded"}
-        
-        # Validate input text
-        if not text or len(text.strip()) < 50:
-            return {"error": "Text too short for summarization"}
-        
-        # Calculate target summary length based on input text length
-        words = text.split()
-        word_count = len(words)
-        
-        if word_count < 20:
-            return {"error": "Document too short for summarization"}
-        
-        # Determine target summary length based on document size
-        if word_count < 500:
-            target_length = max(50, int(word_count * 0.4))
-        elif word_count < 2000:
-            target_length = max(100, int(word_count * 0.3))
-        elif word_count < 5000:
-            target_length = max(200, int(word_count * 0.25))
-        else:
-            target_length = max(400, int(word_count * 0.2))
-        
-        # Ensure target_length doesn't exceed input length
-        target_length = min(target_length, word_count - 5)  # Leave some words for processing
-        
-        # Split text into chunks
-        chunks = chunk_text(text, max_length=1024)
-        
-        if len(chunks) == 1:
-            # Single chunk - comprehensive summary
-            try:
-                summary = st.session_state.summarizer(
-                    chunks[0], 
-                    max_length=target_length,
-                    min_length=max(30, int(target_length * 0.3)),
-                    do_sample=False
-                )
-                return {"summary": summary[0]['summary_text']}
-            except Exception as e:
-                # Fallback to simple summarization
-                logger.warning(f"Model failed, using fallback: {str(e)}")
-                fallback_summary = simple_fallback_summary(chunks[0])
-                return {"summary": fallback_summary}
-        
-        else:
-            # Multiple chunks - process each comprehensively
-            summaries = []
-            chunk_target = max(50, int(target_length / len(chunks)))
-            
-            for i, chunk in enumerate(chunks):
-                if len(chunk.strip()) > 30:
-                    try:
-                        chunk_summary = st.session_state.summarizer(
-                            chunk, 
-                            max_length=chunk_target,
-                            min_length=max(20, int(chunk_target * 0.3)),
-                            do_sample=False
-                        )
-                        summaries.append(f"Section {i+1}: {chunk_summary[0]['summary_text']}")
-                    except Exception as e:
-                        # Fallback to simple summarization for this chunk
-                        fallback_chunk = simple_fallback_summary(chunk)
-                        summaries.append(f"Section {i+1}: {fallback_chunk}")
-            
-            # Combine summaries
-            combined_summary = "\n\n".join(summaries)
-            
-            # If combined summary is very long, create a final comprehensive summary
-            if len(combined_summary.split()) > target_length * 1.5:
-                try:
-                    final_summary = st.session_state.summarizer(
-                        combined_summary, 
-                        max_length=target_length,
-                        min_length=max(50, int(target_length * 0.5)),
-                        do_sample=False
-                    )
-                    return {"summary": final_summary[0]['summary_text']}
-                except Exception as e:
-                    # Fallback to simple summarization
-                    fallback_final = simple_fallback_summary(combined_summary)
-                    return {"summary": fallback_final}
-            else:
-                return {"summary": combined_summary}
+    if not st.session_state.summarizer:
+        return {"error": "Model not loaded"}
     
-    except Exception as e:
-        logger.error(f"Error in structured summarization: {str(e)}")
-        # Ultimate fallback
+    # Dispatch the per-chunk map stage to the worker pool when enabled
+    map_chunks = None
+    if config.INFERENCE_POOL_ENABLED:
         try:
-            fallback = simple_fallback_summary(text)
-            return {"summary": fallback}
-        except:
-            return {"error": f"Summarization failed: {str(e)}"}
+            # Workers must run the model this session actually loaded, which may be a fallback
+            draft_model_name = config.DRAFT_MODEL if st.session_state.draft_model is not None else None
+            map_chunks = get_inference_pool(st.session_state.model_name, draft_model_name).map
+        except Exception as e:
+            st.warning(f"⚠️ Inference workers unavailable, summarizing in-process: {str(e)}")
+            logger.error(f"Error starting inference pool: {str(e)}")
+    
+    # Group sentences into topical sections when enabled
+    sections = None
+    if config.SEMANTIC_SECTIONS_ENABLED:
+        try:
+            sections, embedding_stats = group_sentences(
+                text,
+                get_sentence_encoder(),
+                max_chars=config.SEMANTIC_SECTION_MAX_CHARS,
+                max_sections=config.SEMANTIC_MAX_SECTIONS
+            )
+            st.session_state.embedding_stats = embedding_stats
+            logger.info(f"Semantic sections: {embedding_stats}")
+        except Exception as e:
+            st.warning(f"⚠️ Semantic sections unavailable, using positional chunks: {str(e)}")
+            logger.error(f"Error building semantic sections: {str(e)}")
+    
+    return summarize_document(text, run_summarizer, map_chunks=map_chunks, word_count=word_count, sections=sections)
 
 def create_download_file(content: str, filename: str, file_type: str = "txt") -> str:
     """Create a properly formatted download file"""
@@ -251,8 +179,15 @@ def create_download_file(content: str, filename: str, file_type: str = "txt") ->
     else:
         return content
 
-def format_summary_with_structure(summary_text: str) -> str:
+def format_summary_with_structure(summary_text: str, sections: Optional[List[Dict]] = None) -> str:
     """Format summary with better structure and formatting"""
+    # Topical sections already carry their own structure
+    if sections:
+        structured_summary = ""
+        for section in sections:
+            structured_summary += f"📌 **{section['title']}**\n\n{section['summary']}\n\n"
+        return structured_summary
+    
     # Add structure markers if not present
     if not any(marker in summary_text.lower() for marker in ['background', 'process', 'concerns', 'guidelines', 'conclusion']):
         # Try to identify and structure the content
@@ -375,6 +310,8 @@ def main():
             for i, item in enumerate(st.session_state.processing_history[-5:]):
                 with st.expander(f"📄 {item['filename']} ({item['timestamp']})"):
                     st.write(f"**Summary:** {item['summary'][:100]}...")
+                    if 'quality' in item:
+                        st.write(f"**Quality:** {item['quality']} ({item['coverage']:.0%} key-term coverage)")
                     st.write(f"**File Size:** {item['file_size']} bytes")
     
     # Main content
@@ -418,37 +355,54 @@ def main():
                                 st.error("❌ Could not extract text from PDF. Please ensure the PDF contains readable text.")
                             else:
                                 # Show extracted text length and analysis
-                                words = text.split()
-                                word_count = len(words)
+                                doc_stats = compute_text_stats(text)
+                                word_count = doc_stats["words"]
                                 st.info(f"📖 Extracted {len(text):,} characters ({word_count:,} words) from PDF")
                                 
                                 # Document analysis insights
                                 with st.expander("📊 Document Analysis"):
                                     col_analysis1, col_analysis2, col_analysis3 = st.columns(3)
                                     with col_analysis1:
-                                        st.metric("Pages", len(text.split("--- Page")) - 1)
+                                        st.metric("Pages", doc_stats["pages"])
                                     with col_analysis2:
-                                        st.metric("Sentences", len(text.split('.')))
+                                        st.metric("Sentences", f"{doc_stats['sentences']:,}")
                                     with col_analysis3:
-                                        st.metric("Paragraphs", len(text.split('\n\n')))
+                                        st.metric("Paragraphs", f"{doc_stats['paragraphs']:,}")
+                                    st.caption(f"Average sentence length: {doc_stats['avg_sentence_length']} words · "
+                                               f"Top terms: {', '.join(doc_stats['top_terms'][:8])}")
                                 
                                 # Show analysis progress
                                 with st.spinner("🤖 AI is analyzing document and generating comprehensive summary..."):
                                     # Generate summary
-                                    summary_result = create_structured_summary(text)
+                                    st.session_state.embedding_stats = None
+                                    summary_result = create_structured_summary(text, word_count=word_count)
+                                
+                                embedding_stats = st.session_state.embedding_stats
+                                if embedding_stats:
+                                    st.caption(f"🧭 {embedding_stats['sections']} topical sections from {embedding_stats['sentences']:,} sentences · "
+                                               f"{embedding_stats['sentences_per_second']:,} sentences/s · "
+                                               f"{embedding_stats['cache_hit_rate']:.0%} embedding cache hits")
                                 
                                 # Store results in session state to prevent refresh issues
                                 st.session_state.current_summary = summary_result
                                 st.session_state.current_text = text
                                 st.session_state.current_filename = uploaded_file.name
                                 st.session_state.current_word_count = word_count
+                                st.session_state.current_stats = doc_stats
                                 
                                 if "error" in summary_result:
                                     st.error(f"❌ {summary_result['error']}")
                                 else:
                                     # Format and display structured summary
-                                    formatted_summary = format_summary_with_structure(summary_result["summary"])
-                                    summary_words = len(summary_result["summary"].split())
+                                    formatted_summary = format_summary_with_structure(summary_result["summary"], summary_result.get("sections"))
+                                    # Section titles repeat the document's key terms, so score the summaries alone
+                                    if "sections" in summary_result:
+                                        summary_body = " ".join(section["summary"] for section in summary_result["sections"])
+                                    else:
+                                        summary_body = summary_result["summary"]
+                                    summary_stats = compute_summary_stats(summary_body, doc_stats)
+                                    summary_words = summary_stats["words"]
+                                    compression_ratio = summary_stats["compression_ratio"]
                                     st.success(f"✅ Comprehensive Summary Generated! ({summary_words:,} words)")
                                     
                                     # Create a proper summary display box
@@ -461,9 +415,10 @@ def main():
                                         st.markdown(formatted_summary)
                                         
                                         # Summary quality indicator
-                                        summary_quality = "High" if summary_words > 200 else "Medium" if summary_words > 100 else "Basic"
+                                        summary_quality = summary_stats["quality"]
                                         quality_color = "🟢" if summary_quality == "High" else "🟡" if summary_quality == "Medium" else "🔴"
-                                        st.info(f"{quality_color} **Summary Quality**: {summary_quality} ({summary_words:,} words)")
+                                        st.info(f"{quality_color} **Summary Quality**: {summary_quality} ({summary_words:,} words, "
+                                                f"{summary_stats['coverage']:.0%} key-term coverage, {summary_stats['redundancy']:.0%} redundancy)")
                                         
                                         # Also show raw summary in expandable section
                                         with st.expander("📄 View Raw Summary"):
@@ -500,7 +455,6 @@ def main():
                                     with col_metrics2:
                                         st.metric("Summary Length", f"{len(summary_result['summary']):,} chars")
                                     with col_metrics3:
-                                        compression_ratio = round((1 - len(summary_result["summary"]) / len(text)) * 100, 1)
                                         st.metric("Compression", f"{compression_ratio}%")
                                     
                                     # Download section
@@ -520,6 +474,8 @@ Model: {st.session_state.model_name}
 Original document length: {len(st.session_state.current_text):,} characters ({st.session_state.current_word_count:,} words)
 Summary length: {len(summary_result['summary']):,} characters ({summary_words:,} words)
 Compression ratio: {compression_ratio}%
+Key-term coverage: {summary_stats['coverage']:.0%}
+Redundancy: {summary_stats['redundancy']:.0%}
 """
                                         
                                         # Create download button with proper encoding
@@ -584,6 +540,7 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         <p><strong>Original:</strong> {len(st.session_state.current_text):,} characters ({st.session_state.current_word_count:,} words)</p>
         <p><strong>Summary:</strong> {len(summary_result['summary']):,} characters ({summary_words:,} words)</p>
         <p><strong>Compression:</strong> {compression_ratio}%</p>
+        <p><strong>Key-term coverage:</strong> {summary_stats['coverage']:.0%} &middot; <strong>Redundancy:</strong> {summary_stats['redundancy']:.0%}</p>
     </div>
 </body>
 </html>"""
@@ -604,7 +561,11 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
                                         "file_size": uploaded_file.size,
                                         "timestamp": datetime.now().strftime("%H:%M:%S"),
                                         "text_length": len(text),
-                                        "summary_length": len(summary_result["summary"])
+                                        "summary_length": len(summary_result["summary"]),
+                                        "word_count": word_count,
+                                        "summary_words": summary_words,
+                                        "coverage": summary_stats["coverage"],
+                                        "quality": summary_stats["quality"]
                                     }
                                     st.session_state.processing_history.append(history_item)
                         
@@ -662,7 +623,7 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         if st.session_state.processing_history:
             st.subheader("📈 Usage Statistics")
             total_files = len(st.session_state.processing_history)
-            total_words = sum(item.get('summary_length', 0) for item in st.session_state.processing_history)
+            total_words = sum(item.get('summary_words', 0) for item in st.session_state.processing_history)
             avg_words = total_words // total_files if total_files > 0 else 0
             
             col_stats1, col_stats2, col_stats3 = st.columns(3)
@@ -0,0 +1,108 @@
+"""
+Assisted (speculative) decoding for PDF Summarizer
+A small draft seq2seq model proposes tokens that the main summarization model verifies
+"""
+
+import logging
+import time
+from typing import Dict, Optional
+
+import torch
+from transformers import AutoModelForSeq2SeqLM
+
+from model_cache import resolve_model_source
+
+logger = logging.getLogger(__name__)
+
+def load_draft_model(model_name: str, main_model, device):
+    """Load the draft model and check it shares the main model's vocabulary"""
+    source, kwargs = resolve_model_source(model_name)
+    draft_model = AutoModelForSeq2SeqLM.from_pretrained(source, low_cpu_mem_usage=True, **kwargs)
+
+    # Draft tokens are verified by id, so both models must use the same tokenizer
+    if draft_model.config.vocab_size != main_model.config.vocab_size:
+        raise ValueError(
+            f"Draft model {model_name} has vocab size {draft_model.config.vocab_size}, "
+            f"expected {main_model.config.vocab_size}"
+        )
+
+    draft_model.to(device)
+    draft_model.eval()
+    return draft_model
+
+def assisted_generation_kwargs(draft_model) -> Dict:
+    """Extra generate() arguments that enable assisted decoding with the draft model"""
+    if draft_model is None:
+        return {}
+
+    # Assisted generation only supports a single beam, so the output matches
+    # greedy decoding of the main model rather than its default beam search
+    return {"assistant_model": draft_model, "num_beams": 1}
+
+class ForwardCounter:
+    """Count decoder forward passes of a model while the context is active"""
+
+    def __init__(self, model):
+        self.model = model
+        self.calls = 0
+        self._handle = None
+
+    def _hook(self, module, inputs, outputs):
+        self.calls += 1
+
+    def __enter__(self):
+        # generate() runs the encoder through get_encoder(), so top-level
+        # forward calls correspond to decoding steps only
+        self._handle = self.model.register_forward_hook(self._hook)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._handle.remove()
+        self._handle = None
+
+def generate_with_stats(model, tokenizer, text: str, max_length: int, min_length: int,
+                        draft_model=None, num_beams: Optional[int] = None) -> Dict:
+    """Summarize one chunk and report timing and draft acceptance statistics"""
+    inputs = tokenizer(text, return_tensors="pt", truncation=True).to(model.device)
+
+    generate_kwargs = {"max_length": max_length, "min_length": min_length, "do_sample": False}
+    if draft_model is not None:
+        generate_kwargs.update(assisted_generation_kwargs(draft_model))
+    elif num_beams is not None:
+        generate_kwargs["num_beams"] = num_beams
+
+    with ForwardCounter(model) as target_counter:
+        if draft_model is not None:
+            with ForwardCounter(draft_model) as draft_counter:
+                start = time.perf_counter()
+                with torch.no_grad():
+                    output_ids = model.generate(**inputs, **generate_kwargs)
+                elapsed = time.perf_counter() - start
+            draft_calls = draft_counter.calls
+        else:
+            start = time.perf_counter()
+            with torch.no_grad():
+                output_ids = model.generate(**inputs, **generate_kwargs)
+            elapsed = time.perf_counter() - start
+            draft_calls = 0
+
+    # The first output id is the decoder start token
+    new_tokens = output_ids.shape[-1] - 1
+    target_calls = target_counter.calls
+
+    # Every verification pass emits the accepted draft tokens plus one token
+    # from the main model, so the difference is the number of accepted drafts
+    acceptance_rate = None
+    if draft_calls:
+        accepted = max(0, new_tokens - target_calls)
+        acceptance_rate = min(1.0, accepted / draft_calls)
+
+    return {
+        "summary": tokenizer.decode(output_ids[0], skip_special_tokens=True),
+        "output_ids": output_ids[0].tolist(),
+        "seconds": elapsed,
+        "new_tokens": new_tokens,
+        "target_calls": target_calls,
+        "draft_calls": draft_calls,
+        "acceptance_rate": acceptance_rate,
+    }
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Assisted Decoding Benchmark
+Compares the default decoding, plain greedy decoding and draft-model assisted decoding per chunk.
+
+Usage:
+    python benchmarks/benchmark_assisted_decoding.py document.pdf
+    python benchmarks/benchmark_assisted_decoding.py notes.txt --draft-model sshleifer/distilbart-xsum-12-1
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import torch
+
+import config
+from summarization import load_document, chunk_text, compute_target_length
+from assisted_decoding import load_draft_model, generate_with_stats
+from model_cache import load_model
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark assisted decoding on CPU")
+    parser.add_argument("document", type=Path, help="PDF or text file to summarize")
+    parser.add_argument("--model", default=config.DEFAULT_MODEL, help="Main summarization model")
+    parser.add_argument("--draft-model", default=config.DRAFT_MODEL, help="Draft model for assisted decoding")
+    parser.add_argument("--max-chunks", type=int, default=8, help="Number of chunks to benchmark")
+    parser.add_argument("--threads", type=int, default=None, help="torch intra-op threads")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    device = torch.device("cpu")
+
+    text = load_document(args.document)
+    words = text.split()
+    if len(words) < 20:
+        print("❌ Document too short for summarization")
+        sys.exit(1)
+
+    chunks = chunk_text(text, max_length=config.CHUNK_SIZE)
+    target_length = compute_target_length(len(words))
+    if len(chunks) == 1:
+        max_length = target_length
+        min_length = max(30, int(target_length * 0.3))
+    else:
+        max_length = max(50, int(target_length / len(chunks)))
+        min_length = max(20, int(max_length * 0.3))
+    chunks = [chunk for chunk in chunks if len(chunk.strip()) > 30][:args.max_chunks]
+
+    print(f"Loading {args.model} and draft {args.draft_model} on CPU...")
+    tokenizer, model, _ = load_model(args.model, device)
+    draft_model = load_draft_model(args.draft_model, model, device)
+
+    # The app's default decoding uses the model's generation config (beam search
+    # for DistilBART), which assisted decoding cannot reproduce
+    default_beams = model.generation_config.num_beams
+
+    # Warm up every path so the first chunk doesn't pay one-off costs
+    generate_with_stats(model, tokenizer, chunks[0], max_length, min_length)
+    generate_with_stats(model, tokenizer, chunks[0], max_length, min_length, num_beams=1)
+    generate_with_stats(model, tokenizer, chunks[0], max_length, min_length, draft_model=draft_model)
+
+    print(f"\n{len(chunks)} chunks, max_length={max_length}, min_length={min_length}, "
+          f"default num_beams={default_beams}, threads={torch.get_num_threads()}\n")
+    header = (f"{'chunk':>5} {'tokens':>6} {'default s':>9} {'greedy s':>9} {'assisted s':>10} "
+              f"{'vs default':>10} {'vs greedy':>9} {'accept':>7} {'=default':>8} {'=greedy':>7}")
+    print(header)
+    print("-" * len(header))
+
+    total_default = 0.0
+    total_greedy = 0.0
+    total_assisted = 0.0
+    acceptance_rates = []
+    same_as_default = 0
+    same_as_greedy = 0
+
+    for i, chunk in enumerate(chunks, 1):
+        default = generate_with_stats(model, tokenizer, chunk, max_length, min_length)
+        greedy = generate_with_stats(model, tokenizer, chunk, max_length, min_length, num_beams=1)
+        assisted = generate_with_stats(model, tokenizer, chunk, max_length, min_length, draft_model=draft_model)
+
+        speedup_default = default["seconds"] / assisted["seconds"] if assisted["seconds"] else 0.0
+        speedup_greedy = greedy["seconds"] / assisted["seconds"] if assisted["seconds"] else 0.0
+        matches_default = default["output_ids"] == assisted["output_ids"]
+        matches_greedy = greedy["output_ids"] == assisted["output_ids"]
+        acceptance = assisted["acceptance_rate"] or 0.0
+
+        total_default += default["seconds"]
+        total_greedy += greedy["seconds"]
+        total_assisted += assisted["seconds"]
+        acceptance_rates.append(acceptance)
+        same_as_default += int(matches_default)
+        same_as_greedy += int(matches_greedy)
+
+        print(f"{i:>5} {assisted['new_tokens']:>6} {default['seconds']:>9.3f} {greedy['seconds']:>9.3f} "
+              f"{assisted['seconds']:>10.3f} {speedup_default:>9.2f}x {speedup_greedy:>8.2f}x {acceptance:>6.1%} "
+              f"{'yes' if matches_default else 'no':>8} {'yes' if matches_greedy else 'no':>7}")
+
+    print("-" * len(header))
+    mean_acceptance = sum(acceptance_rates) / len(acceptance_rates)
+    print(f"Total: default {total_default:.2f}s, greedy {total_greedy:.2f}s, assisted {total_assisted:.2f}s")
+    if total_assisted:
+        print(f"Speedup over the app's default decoding: {total_default / total_assisted:.2f}x "
+              f"(over plain greedy: {total_greedy / total_assisted:.2f}x)")
+    print(f"Mean acceptance rate: {mean_acceptance:.1%}")
+    print(f"Identical to default decoding: {same_as_default}/{len(chunks)}, "
+          f"identical to greedy: {same_as_greedy}/{len(chunks)}")
+    if default_beams and default_beams > 1:
+        print(f"⚠️ Assisted decoding replaces {default_beams}-beam search with greedy decoding, "
+              f"so summaries can differ from the default path")
+
+if __name__ == "__main__":
+    main()
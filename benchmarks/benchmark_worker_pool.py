@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Inference Worker Pool Scaling Benchmark
+Measures chunk throughput of the map stage from 1 to N worker processes.
+
+Usage:
+    python benchmarks/benchmark_worker_pool.py document.pdf --max-workers 8 --pin
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from summarization import load_document, chunk_text
+from inference_pool import InferenceWorkerPool, available_cpus
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark inference worker pool scaling")
+    parser.add_argument("document", type=Path, help="PDF or text file to summarize")
+    parser.add_argument("--model", default=config.DEFAULT_MODEL, help="Summarization model")
+    parser.add_argument("--max-workers", type=int, default=max(1, len(available_cpus()) // 4),
+                        help="Largest pool size to measure")
+    parser.add_argument("--threads-per-worker", type=int, default=None,
+                        help="torch threads per worker (default: split cores evenly)")
+    parser.add_argument("--pin", action="store_true", help="Pin each worker to its own cores")
+    parser.add_argument("--chunks", type=int, default=32, help="Chunks per measurement")
+    parser.add_argument("--max-length", type=int, default=80, help="Summary max_length per chunk")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    text = load_document(args.document)
+    chunks = [chunk for chunk in chunk_text(text, max_length=config.CHUNK_SIZE) if len(chunk.strip()) > 30]
+    if not chunks:
+        print("❌ No text chunks to summarize")
+        sys.exit(1)
+
+    # Repeat the document's chunks so every pool size gets the same workload
+    workload = (chunks * (args.chunks // len(chunks) + 1))[:args.chunks]
+    min_length = max(20, int(args.max_length * 0.3))
+
+    print(f"{len(available_cpus())} CPUs available, {len(workload)} chunks per run, model {args.model}\n")
+    header = f"{'workers':>7} {'threads':>7} {'startup s':>9} {'run s':>8} {'chunks/s':>9} {'scaling':>8}"
+    print(header)
+    print("-" * len(header))
+
+    baseline = None
+    for num_workers in range(1, args.max_workers + 1):
+        pool = InferenceWorkerPool(
+            model_name=args.model,
+            num_workers=num_workers,
+            threads_per_worker=args.threads_per_worker,
+            pin_cpus=args.pin
+        )
+
+        start = time.perf_counter()
+        pool.start()
+        startup = time.perf_counter() - start
+
+        try:
+            # Warm up every worker once before timing
+            pool.map(workload[:num_workers], args.max_length, min_length)
+
+            start = time.perf_counter()
+            results = pool.map(workload, args.max_length, min_length)
+            elapsed = time.perf_counter() - start
+        finally:
+            pool.close()
+
+        failed = sum(1 for result in results if result is None)
+        throughput = len(workload) / elapsed
+        if baseline is None:
+            baseline = throughput
+
+        print(f"{num_workers:>7} {pool.threads_per_worker:>7} {startup:>9.1f} {elapsed:>8.2f} "
+              f"{throughput:>9.2f} {throughput / baseline:>7.2f}x"
+              + (f"  ({failed} failed)" if failed else ""))
+
+if __name__ == "__main__":
+    main()
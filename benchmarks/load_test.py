@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Load Test for PDF Summarizer
+Simulates concurrent Streamlit sessions uploading PDFs and reports capacity numbers.
+
+The harness reproduces app.py's serving layout:
+- every session loads its own model, as load_summarization_model() stores the
+  summarizer in st.session_state, and sessions run concurrently on those copies
+- with INFERENCE_POOL_ENABLED the map stage goes to one worker pool shared by
+  all sessions, while single-chunk and reduce steps stay on the session's model
+- ASSISTED_DECODING_ENABLED loads a draft model per session, and
+  SEMANTIC_SECTIONS_ENABLED shares one sentence encoder across sessions
+
+Each request runs the steps of a "Generate Summary" click: PDF extraction,
+document statistics, optional semantic sections, summarize_document() and
+summary statistics. Queueing time is the extra latency over the same document
+summarized by a single, uncontended session.
+
+Usage:
+    python benchmarks/load_test.py --corpus pdfs/ --sessions 1 2 4 8 16
+    python benchmarks/load_test.py --model stub --stub-model-mb 1200 --sessions 1 4 8
+    python benchmarks/load_test.py --pool on --sessions 1 4 16
+    python benchmarks/load_test.py --streamlit --sessions 1 4 8
+"""
+
+import argparse
+import gc
+import io
+import os
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+import config
+from summarization import extract_text_from_pdf, summarize_document
+from text_stats import compute_text_stats, compute_summary_stats
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+
+class StubSummarizer:
+    """Stand-in for a session's model when no weights are available.
+
+    It burns CPU in NumPy matrix products, which release the GIL like torch
+    inference does, so concurrent sessions compete for CPU cores rather than
+    taking turns on one. model_mb allocates and touches that much memory to
+    stand in for the session's copy of the weights.
+    """
+
+    MATRIX_SIZE = 256
+    _seconds_per_product = None
+
+    def __init__(self, seconds_per_token: float = 0.002, model_mb: Optional[int] = None):
+        self.seconds_per_token = seconds_per_token
+        self._weights = bytearray(b"\x01") * (model_mb * 1024 * 1024) if model_mb else None
+        self._matrix = np.random.default_rng(0).random((self.MATRIX_SIZE, self.MATRIX_SIZE), dtype=np.float32)
+        if StubSummarizer._seconds_per_product is None:
+            StubSummarizer._seconds_per_product = self._calibrate()
+
+    def _burn(self, products: int):
+        for _ in range(products):
+            np.dot(self._matrix, self._matrix)
+
+    def _calibrate(self) -> float:
+        products = 200
+        start = time.perf_counter()
+        self._burn(products)
+        return (time.perf_counter() - start) / products
+
+    def __call__(self, text: str, max_length: int, min_length: int) -> str:
+        self._burn(max(1, round(self.seconds_per_token * max_length / self._seconds_per_product)))
+        return " ".join(text.split()[:max_length])
+
+class PipelineSummarizer:
+    """Adapter from a transformers summarization pipeline to summarize_document()"""
+
+    def __init__(self, pipeline, generation_kwargs: Optional[Dict] = None):
+        self.pipeline = pipeline
+        self.generation_kwargs = generation_kwargs or {}
+
+    def __call__(self, text: str, max_length: int, min_length: int) -> str:
+        summary = self.pipeline(text, max_length=max_length, min_length=min_length, do_sample=False,
+                                **self.generation_kwargs)
+        return summary[0]['summary_text']
+
+class Deployment:
+    """The app's serving layout: a model per session plus the shared pool and sentence encoder"""
+
+    def __init__(self, model_choice: str, pool: bool, assisted: bool, semantic: bool,
+                 stub_model_mb: Optional[int] = None):
+        self.assisted = assisted
+        self.stub_model_mb = stub_model_mb
+        self.model_name = None
+        self.device = None
+        self.pool = None
+        self.encoder = None
+        self.notes = []
+
+        if model_choice in ("auto", "real"):
+            try:
+                import torch
+                from model_cache import load_with_fallback
+
+                self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+                # Find the model sessions will end up with, then let sessions load their own copies
+                self.model_name, _, model, _ = load_with_fallback([config.DEFAULT_MODEL] + config.FALLBACK_MODELS,
+                                                                  self.device)
+                del model
+            except Exception as e:
+                if model_choice == "real":
+                    raise
+                print(f"⚠️ Model weights unavailable ({e}), using stub model")
+        self.real = self.model_name is not None
+
+        if assisted and not self.real:
+            self.assisted = False
+            self.notes.append("assisted decoding skipped (stub model)")
+
+        if pool:
+            if self.real:
+                from inference_pool import InferenceWorkerPool
+
+                self.pool = InferenceWorkerPool(
+                    model_name=self.model_name,
+                    num_workers=config.MAX_CONCURRENT_PROCESSES,
+                    threads_per_worker=config.INFERENCE_THREADS_PER_WORKER,
+                    pin_cpus=config.PIN_WORKER_CPUS,
+                    draft_model_name=config.DRAFT_MODEL if self.assisted else None,
+                    timeout=config.INFERENCE_TIMEOUT
+                )
+                self.pool.start()
+            else:
+                self.notes.append("worker pool skipped (needs model weights)")
+
+        if semantic:
+            try:
+                from semantic_sections import EmbeddingCache, SentenceEncoder
+
+                self.encoder = SentenceEncoder(config.EMBEDDING_MODEL, EmbeddingCache(config.EMBEDDING_CACHE_PATH),
+                                               batch_size=config.EMBEDDING_BATCH_SIZE)
+            except Exception as e:
+                self.notes.append(f"semantic sections skipped ({e})")
+
+    def describe(self) -> str:
+        parts = [f"one {self.model_name + ' on ' + str(self.device) if self.real else 'stub model'} per session"]
+        if self.assisted:
+            parts.append(f"draft {config.DRAFT_MODEL} per session")
+        if self.pool is not None:
+            parts.append(f"shared {self.pool.num_workers}-worker pool for the map stage")
+        if self.encoder is not None:
+            parts.append(f"shared {config.EMBEDDING_MODEL} encoder for semantic sections")
+        return ", ".join(parts + self.notes)
+
+    def load_session_model(self) -> Callable[[str, int, int], str]:
+        """What load_summarization_model() gives one session"""
+        if not self.real:
+            return StubSummarizer(model_mb=self.stub_model_mb)
+
+        from transformers import pipeline
+        from model_cache import load_model
+        from assisted_decoding import load_draft_model, assisted_generation_kwargs
+
+        tokenizer, model, _ = load_model(self.model_name, self.device)
+        summarizer = pipeline("summarization", model=model, tokenizer=tokenizer, device=self.device)
+        generation_kwargs = {}
+        if self.assisted:
+            generation_kwargs = assisted_generation_kwargs(load_draft_model(config.DRAFT_MODEL, model, self.device))
+        return PipelineSummarizer(summarizer, generation_kwargs)
+
+    def extra_pids(self) -> List[int]:
+        return self.pool.worker_pids() if self.pool is not None else []
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+
+class RssSampler:
+    """Track peak resident memory of this process and the pool workers in a background thread"""
+
+    def __init__(self, extra_pids: Callable[[], List[int]], interval: float = 0.05):
+        self.extra_pids = extra_pids
+        self.interval = interval
+        self.peak_mb = self.sample()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def sample(self) -> float:
+        return rss_mb("self") + sum(rss_mb(pid) for pid in self.extra_pids())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, self.sample())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, self.sample())
+
+def rss_mb(pid="self") -> float:
+    """Resident set size of a process in MB (Linux), 0 where unavailable"""
+    try:
+        with open(f"/proc/{pid}/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return 0.0
+
+def load_corpus(corpus_dir) -> List[Dict]:
+    """Read PDFs as uploaded bytes, or generate synthetic documents when no corpus is given"""
+    documents = []
+    if corpus_dir:
+        for path in sorted(Path(corpus_dir).glob("*.pdf")):
+            documents.append({"name": path.name, "pdf": path.read_bytes()})
+        for path in sorted(Path(corpus_dir).glob("*.txt")):
+            documents.append({"name": path.name, "text": path.read_text(encoding="utf-8")})
+
+    if not documents:
+        print("⚠️ No corpus documents found, using synthetic documents")
+        rng = random.Random(0)
+        vocabulary = ("revenue growth policy contract board review market customer risk audit budget "
+                      "forecast supplier compliance quarter strategy staff report region product").split()
+        for pages in [1, 3, 10]:
+            text = ""
+            for page in range(1, pages + 1):
+                sentences = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(8, 20))).capitalize() + "."
+                             for _ in range(25)]
+                text += f"\n--- Page {page} ---\n{' '.join(sentences)}\n"
+            documents.append({"name": f"synthetic_{pages}_pages", "text": text.strip()})
+    return documents
+
+def process_document(document: Dict, summarize: Callable[[str, int, int], str], deployment: Deployment) -> bool:
+    """One "Generate Summary" click; returns False if summarization reported an error"""
+    if "pdf" in document:
+        text = extract_text_from_pdf(io.BytesIO(document["pdf"])) or ""
+    else:
+        text = document["text"]
+    doc_stats = compute_text_stats(text)
+
+    sections = None
+    if deployment.encoder is not None:
+        from semantic_sections import group_sentences
+
+        sections, _ = group_sentences(text, deployment.encoder, max_chars=config.SEMANTIC_SECTION_MAX_CHARS,
+                                      max_sections=config.SEMANTIC_MAX_SECTIONS)
+
+    map_chunks = deployment.pool.map if deployment.pool is not None else None
+    summary_result = summarize_document(text, summarize, map_chunks=map_chunks,
+                                        word_count=doc_stats["words"], sections=sections)
+    if "sections" in summary_result:
+        compute_summary_stats(" ".join(section["summary"] for section in summary_result["sections"]), doc_stats)
+    elif "summary" in summary_result:
+        compute_summary_stats(summary_result["summary"], doc_stats)
+    return "error" not in summary_result
+
+def measure_service_times(documents: List[Dict], deployment: Deployment) -> Dict[str, float]:
+    """Latency of each document for a single session with the machine to itself"""
+    summarize = deployment.load_session_model()
+    service_times = {}
+    for document in [documents[0]] + documents:  # the first run warms up
+        try:
+            start = time.perf_counter()
+            process_document(document, summarize, deployment)
+            service_times[document["name"]] = time.perf_counter() - start
+        except Exception as e:
+            print(f"⚠️ {document['name']} failed in a single session, no queueing baseline: {e}")
+    return service_times
+
+def run_session(deployment: Deployment, documents: List[Dict], service_times: Dict[str, float], requests: int,
+                rng: random.Random, think_time: float, start_barrier: threading.Barrier,
+                results: List[Dict], results_lock: threading.Lock):
+    """One simulated user: load a model, then upload documents one after another"""
+    start = time.perf_counter()
+    try:
+        summarize = deployment.load_session_model()
+    except Exception as e:
+        # Release the other sessions and the main thread instead of leaving them at the barrier
+        print(f"❌ Session model failed to load: {e}")
+        start_barrier.abort()
+        return
+    load_seconds = time.perf_counter() - start
+
+    try:
+        start_barrier.wait()
+    except threading.BrokenBarrierError:
+        return
+
+    for _ in range(requests):
+        document = rng.choice(documents)
+        start = time.perf_counter()
+        try:
+            ok = process_document(document, summarize, deployment)
+        except Exception as e:
+            print(f"⚠️ Request for {document['name']} failed: {e}")
+            ok = False
+        latency = time.perf_counter() - start
+
+        service_time = service_times.get(document["name"])
+        with results_lock:
+            results.append({
+                "latency": latency,
+                "queue": max(0.0, latency - service_time) if service_time is not None else None,
+                "load": load_seconds,
+                "error": not ok,
+            })
+
+        if think_time:
+            time.sleep(rng.uniform(0, 2 * think_time))
+
+def run_streamlit_session(requests: int, timeout: float, start_barrier: threading.Barrier,
+                          results: List[Dict], results_lock: threading.Lock):
+    """One simulated browser session rendering app.py through Streamlit's AppTest.
+
+    AppTest cannot drive st.file_uploader, so this measures script run latency only.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    try:
+        start_barrier.wait()
+    except threading.BrokenBarrierError:
+        return
+
+    for _ in range(requests):
+        start = time.perf_counter()
+        try:
+            app = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+            app.run()
+            ok = not app.exception
+        except Exception as e:
+            print(f"⚠️ App run failed: {e}")
+            ok = False
+        latency = time.perf_counter() - start
+        with results_lock:
+            results.append({"latency": latency, "queue": None, "load": 0.0, "error": not ok})
+
+def run_level(sessions: int, target: Callable, args: Callable[[int], tuple],
+              extra_pids: Callable[[], List[int]]) -> Optional[Dict]:
+    """Run one session count to completion and summarize its measurements.
+
+    Returns None when a session's model failed to load. Latency and queueing
+    cover successful requests only; failed requests count as errors.
+    """
+    results: List[Dict] = []
+    results_lock = threading.Lock()
+    start_barrier = threading.Barrier(sessions + 1)
+    gc.collect()
+
+    with RssSampler(extra_pids) as rss:
+        baseline_mb = rss.peak_mb
+        threads = [threading.Thread(target=target, args=args(i) + (start_barrier, results, results_lock), daemon=True)
+                   for i in range(sessions)]
+        for thread in threads:
+            thread.start()
+
+        # Sessions load their models first; the clock starts once all are ready
+        try:
+            start_barrier.wait()
+        except threading.BrokenBarrierError:
+            for thread in threads:
+                thread.join()
+            return None
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+    succeeded = [r for r in results if not r["error"]]
+    latencies = np.asarray([r["latency"] for r in succeeded], dtype=float)
+    queues = np.asarray([r["queue"] for r in succeeded if r["queue"] is not None], dtype=float)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies.size else (np.nan, np.nan, np.nan)
+    return {
+        "sessions": sessions,
+        "requests": len(results),
+        "errors": len(results) - len(succeeded),
+        "throughput": len(succeeded) / elapsed,
+        "p50": p50,
+        "p95": p95,
+        "p99": p99,
+        "queue_mean": float(queues.mean()) if queues.size else np.nan,
+        "queue_p95": float(np.percentile(queues, 95)) if queues.size else np.nan,
+        "load_mean": float(np.mean([r["load"] for r in results])) if results else np.nan,
+        "peak_rss_mb": rss.peak_mb,
+        "rss_per_session_mb": max(0.0, rss.peak_mb - baseline_mb) / sessions,
+    }
+
+def resolve_flag(choice: str, configured: bool) -> bool:
+    return configured if choice == "config" else choice == "on"
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Simulate concurrent users of the PDF summarizer")
+    parser.add_argument("--corpus", help="Directory of PDF (or .txt) documents to upload")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="Concurrent session counts to measure")
+    parser.add_argument("--requests", type=int, default=3, help="Documents per session")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between a session's uploads (s)")
+    parser.add_argument("--model", choices=["auto", "real", "stub"], default="auto",
+                        help="auto uses the real model when weights are available, otherwise the stub")
+    parser.add_argument("--stub-model-mb", type=int, default=None,
+                        help="Memory each stub session allocates to stand in for its model copy")
+    parser.add_argument("--pool", choices=["config", "on", "off"], default="config",
+                        help="Shared inference worker pool (default: INFERENCE_POOL_ENABLED)")
+    parser.add_argument("--assisted", choices=["config", "on", "off"], default="config",
+                        help="Assisted decoding (default: ASSISTED_DECODING_ENABLED)")
+    parser.add_argument("--semantic", choices=["config", "on", "off"], default="config",
+                        help="Semantic sections (default: SEMANTIC_SECTIONS_ENABLED)")
+    parser.add_argument("--streamlit", action="store_true",
+                        help="Drive app.py with Streamlit's AppTest instead of the summarization core")
+    parser.add_argument("--timeout", type=float, default=60, help="AppTest script timeout (s)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for document choice")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    deployment = None
+    if args.streamlit:
+        description = "app.py via AppTest (page render only)"
+        target = run_streamlit_session
+        make_args = lambda i: (args.requests, args.timeout)
+        extra_pids = lambda: []
+    else:
+        documents = load_corpus(args.corpus)
+        deployment = Deployment(
+            args.model,
+            pool=resolve_flag(args.pool, config.INFERENCE_POOL_ENABLED),
+            assisted=resolve_flag(args.assisted, config.ASSISTED_DECODING_ENABLED),
+            semantic=resolve_flag(args.semantic, config.SEMANTIC_SECTIONS_ENABLED),
+            stub_model_mb=args.stub_model_mb
+        )
+        description = deployment.describe()
+        service_times = measure_service_times(documents, deployment)
+        target = run_session
+        make_args = lambda i: (deployment, documents, service_times, args.requests,
+                               random.Random(args.seed + i), args.think_time)
+        extra_pids = deployment.extra_pids
+
+    print(f"Topology: {description}")
+    print(f"{args.requests} requests per session; queue = latency above a single uncontended session; "
+          "latency and queue cover successful requests, nan where none succeeded\n")
+    if deployment is not None and not deployment.real and not args.stub_model_mb:
+        print("⚠️ Stub sessions hold no model weights, so RSS excludes the per-session model copy; "
+              "pass --stub-model-mb to simulate it\n")
+
+    header = (f"{'sessions':>8} {'reqs':>5} {'err':>4} {'req/s':>7} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} "
+              f"{'queue s':>8} {'q95 s':>7} {'load s':>7} {'RSS MB':>8} {'MB/sess':>8}")
+    print(header)
+    print("-" * len(header))
+
+    try:
+        for sessions in args.sessions:
+            level = run_level(sessions, target, make_args, extra_pids)
+            if level is None:
+                print(f"{sessions:>8}  aborted: a session's model failed to load")
+                continue
+            print(f"{level['sessions']:>8} {level['requests']:>5} {level['errors']:>4} {level['throughput']:>7.2f} "
+                  f"{level['p50']:>7.2f} {level['p95']:>7.2f} {level['p99']:>7.2f} {level['queue_mean']:>8.2f} "
+                  f"{level['queue_p95']:>7.2f} {level['load_mean']:>7.1f} {level['peak_rss_mb']:>8.0f} "
+                  f"{level['rss_per_session_mb']:>8.1f}")
+    finally:
+        if deployment is not None:
+            deployment.close()
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@ Configuration file for PDF Summarizer
 Customize these settings to match your requirements
 """
 
+import os
+
 # Application Settings
 APP_NAME = "Secure PDF Summarizer - Professional Edition"
 APP_VERSION = "2.0.0"
@@ -15,6 +17,19 @@ FALLBACK_MODELS = [
     "google/pegasus-xsum"
 ]
 
+# Model Artifact Cache
+# Populate with `python model_cache.py prefetch`; cached models always load from disk
+MODEL_CACHE_DIR = os.environ.get("MODEL_CACHE_DIR", "model_cache")
+OFFLINE_MODE = False  # never contact the model hub; only cached models can load
+
+# Assisted Decoding Settings
+# A smaller draft model proposes tokens that DEFAULT_MODEL verifies.
+# The draft must share the main model's tokenizer (BART vocabulary).
+# Enabling this switches generation from the model's default beam search to
+# greedy decoding, so summaries can differ from the default path.
+ASSISTED_DECODING_ENABLED = False
+DRAFT_MODEL = "sshleifer/distilbart-cnn-12-3"
+
 # Processing Settings
 MAX_FILE_SIZE_MB = 50
 MAX_TEXT_LENGTH = 100000  # characters
@@ -50,7 +65,25 @@ SESSION_TIMEOUT = 3600  # seconds
 # Performance Settings
 GPU_PREFERRED = True
 BATCH_SIZE = 1
-MAX_CONCURRENT_PROCESSES = 1
+MAX_CONCURRENT_PROCESSES = 1  # inference worker processes when the pool is enabled
+
+# Semantic Sections
+# Sentences are embedded, cached on disk by hash and clustered into topical
+# sections that are each summarized once instead of positional chunks
+SEMANTIC_SECTIONS_ENABLED = False
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_BATCH_SIZE = 64
+EMBEDDING_CACHE_PATH = os.path.join(MODEL_CACHE_DIR, "embeddings.sqlite3")
+SEMANTIC_SECTION_MAX_CHARS = 3000  # characters per section, sized for one model call
+SEMANTIC_MAX_SECTIONS = 12  # topics per document; longer topics are split into parts
+
+# Inference Worker Pool
+# Workers each load the model the session loaded (DEFAULT_MODEL or a fallback)
+# once and summarize chunks of the map stage
+INFERENCE_POOL_ENABLED = False
+INFERENCE_THREADS_PER_WORKER = None  # None splits the available cores evenly
+PIN_WORKER_CPUS = False  # pin each worker to its own set of cores (Linux only)
+INFERENCE_TIMEOUT = 300  # seconds to wait for a document's chunks
 
 # Logging Settings
 LOG_LEVEL = "INFO"
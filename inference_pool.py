@@ -0,0 +1,333 @@
+"""
+Inference worker pool for PDF Summarizer
+Each worker process loads the summarization model once with a fixed CPU thread budget
+"""
+
+import itertools
+import logging
+import multiprocessing as mp
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from multiprocessing.connection import wait
+from typing import Deque, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+def available_cpus() -> List[int]:
+    """CPU ids this process is allowed to run on"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def plan_worker_cpus(num_workers: int, threads_per_worker: Optional[int] = None) -> List[List[int]]:
+    """Split the available CPUs into one disjoint core set per worker.
+
+    One core is left for the Streamlit server when there are spare cores.
+    """
+    cpus = available_cpus()
+    if len(cpus) > num_workers:
+        cpus = cpus[1:]
+
+    if threads_per_worker is None:
+        threads_per_worker = max(1, len(cpus) // num_workers)
+
+    plan = []
+    for worker_id in range(num_workers):
+        start = (worker_id * threads_per_worker) % len(cpus)
+        plan.append([cpus[(start + offset) % len(cpus)] for offset in range(threads_per_worker)])
+    return plan
+
+# Seconds between liveness checks while waiting on workers
+LIVENESS_INTERVAL = 1.0
+
+def _worker_main(worker_id, model_name, draft_model_name, num_threads, cpu_ids, connection):
+    """Worker process: load the model once, then summarize chunks sent over its pipe"""
+    try:
+        if cpu_ids and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cpu_ids)
+
+        import torch
+        from transformers import pipeline
+        from assisted_decoding import load_draft_model, assisted_generation_kwargs
+        from model_cache import load_model
+
+        torch.set_num_threads(num_threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass
+
+        device = torch.device("cpu")
+        tokenizer, model, _ = load_model(model_name, device)
+        summarizer = pipeline("summarization", model=model, tokenizer=tokenizer, device=device)
+
+        generation_kwargs = {}
+        if draft_model_name:
+            draft_model = load_draft_model(draft_model_name, model, device)
+            generation_kwargs = assisted_generation_kwargs(draft_model)
+
+    except Exception as e:
+        connection.send(("ready", str(e)))
+        return
+
+    connection.send(("ready", None))
+
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+
+        job_id, index, text, max_length, min_length = task
+        try:
+            summary = summarizer(
+                text,
+                max_length=max_length,
+                min_length=min_length,
+                do_sample=False,
+                **generation_kwargs
+            )
+            connection.send(("result", job_id, index, summary[0]['summary_text']))
+        except Exception as e:
+            logger.warning(f"Worker {worker_id} failed on chunk {index}: {str(e)}")
+            connection.send(("result", job_id, index, None))
+
+@dataclass
+class _Job:
+    """Results of one map() call, filled in by the dispatcher thread"""
+    results: List[Optional[str]]
+    finished: Set[int] = field(default_factory=set)
+    done: threading.Event = field(default_factory=threading.Event)
+
+class InferenceWorkerPool:
+    """Pool of model-serving processes, each fed one chunk at a time over its own pipe.
+
+    A dispatcher thread hands queued chunks to idle workers and watches each
+    process. A worker that dies is replaced and the chunk it was running is
+    reported as failed. Once every worker is gone and restarts are used up,
+    outstanding and future jobs fail immediately. Chunks of a job that timed
+    out are dropped instead of being summarized for nobody.
+    """
+
+    def __init__(self, model_name: str, num_workers: int = 1, threads_per_worker: Optional[int] = None,
+                 pin_cpus: bool = False, draft_model_name: Optional[str] = None, timeout: Optional[float] = None,
+                 max_restarts: Optional[int] = None):
+        self.model_name = model_name
+        self.num_workers = max(1, num_workers)
+        self.draft_model_name = draft_model_name
+        self.timeout = timeout
+        self.pin_cpus = pin_cpus
+        self.max_restarts = 3 * self.num_workers if max_restarts is None else max_restarts
+
+        self.cpu_plan = plan_worker_cpus(self.num_workers, threads_per_worker)
+        self.threads_per_worker = threads_per_worker or len(self.cpu_plan[0])
+
+        self._context = mp.get_context("spawn")
+        self._workers: Dict[int, Dict] = {}  # worker id -> {"process", "connection", "ready", "task"}
+        self._pending: Deque[tuple] = deque()  # (job id, index, chunk, max_length, min_length)
+        self._restarts = 0
+        self._broken: Optional[str] = None
+        self._dispatcher = None
+        self._stopping = threading.Event()
+        self._wakeup_reader, self._wakeup_writer = self._context.Pipe(duplex=False)
+        self._jobs: Dict[int, _Job] = {}
+        self._lock = threading.Lock()
+        self._job_ids = itertools.count()
+
+    def _spawn_worker(self, worker_id: int):
+        parent_connection, child_connection = self._context.Pipe()
+        cpu_ids = self.cpu_plan[worker_id] if self.pin_cpus else None
+        process = self._context.Process(
+            target=_worker_main,
+            args=(worker_id, self.model_name, self.draft_model_name, self.threads_per_worker,
+                  cpu_ids, child_connection),
+            daemon=True
+        )
+        process.start()
+        child_connection.close()
+        self._workers[worker_id] = {"process": process, "connection": parent_connection, "ready": False, "task": None}
+
+    def start(self):
+        """Start the workers and wait until every one has loaded the model"""
+        for worker_id in range(self.num_workers):
+            self._spawn_worker(worker_id)
+
+        # Watch process sentinels too, so a worker that dies while loading
+        # (e.g. OOM-killed) fails startup instead of blocking it forever
+        errors = []
+        waiting = set(self._workers)
+        while waiting:
+            handles = {}
+            for worker_id in waiting:
+                worker = self._workers[worker_id]
+                handles[worker["connection"]] = worker_id
+                handles[worker["process"].sentinel] = worker_id
+
+            for handle in wait(list(handles), timeout=LIVENESS_INTERVAL):
+                worker_id = handles[handle]
+                if worker_id not in waiting:
+                    continue
+                worker = self._workers[worker_id]
+                waiting.discard(worker_id)
+                try:
+                    _, error = worker["connection"].recv()
+                except (EOFError, OSError):
+                    worker["process"].join(timeout=1)
+                    error = f"exited with code {worker['process'].exitcode} while loading"
+                if error:
+                    errors.append(f"worker {worker_id}: {error}")
+                else:
+                    worker["ready"] = True
+
+        if errors:
+            self.close()
+            raise RuntimeError(f"Inference workers failed to load {self.model_name}: {'; '.join(errors)}")
+
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+        logger.info(f"Started {self.num_workers} inference workers with {self.threads_per_worker} threads each")
+
+    def _record_result(self, job_id: int, index: int, summary: Optional[str]):
+        """Store one chunk's result; the caller holds _lock"""
+        job = self._jobs.get(job_id)
+        if job is None or index in job.finished:
+            return
+        job.results[index] = summary
+        job.finished.add(index)
+        if len(job.finished) == len(job.results):
+            job.done.set()
+
+    def _handle_exit(self, worker_id: int):
+        """Fail the chunk a dead worker was running and replace the worker"""
+        worker = self._workers.pop(worker_id)
+        worker["connection"].close()
+        worker["process"].join(timeout=1)
+        logger.warning(f"Inference worker {worker_id} exited with code {worker['process'].exitcode}")
+
+        with self._lock:
+            if worker["task"] is not None:
+                self._record_result(worker["task"][0], worker["task"][1], None)
+
+            if self._restarts < self.max_restarts:
+                self._restarts += 1
+                self._spawn_worker(worker_id)
+            elif not self._workers:
+                self._broken = f"all inference workers exited and {self.max_restarts} restarts are used up"
+                logger.error(f"Inference pool unusable: {self._broken}")
+                self._pending.clear()
+                for job in self._jobs.values():
+                    job.done.set()
+
+    def _assign_tasks(self):
+        """Send queued chunks to idle workers, skipping chunks of abandoned jobs"""
+        with self._lock:
+            for worker in self._workers.values():
+                if not worker["ready"] or worker["task"] is not None:
+                    continue
+                while self._pending:
+                    task = self._pending.popleft()
+                    if task[0] in self._jobs:
+                        break
+                else:
+                    return
+                worker["task"] = task[:2]
+                worker["connection"].send(task)
+
+    def _dispatch(self):
+        """Dispatcher thread: route results, detect dead workers and keep workers busy"""
+        while not self._stopping.is_set():
+            handles = {self._wakeup_reader: None}
+            for worker_id, worker in self._workers.items():
+                handles[worker["connection"]] = worker_id
+                handles[worker["process"].sentinel] = worker_id
+
+            for handle in wait(list(handles), timeout=LIVENESS_INTERVAL):
+                if handle is self._wakeup_reader:
+                    self._wakeup_reader.recv_bytes()
+                    continue
+                worker_id = handles[handle]
+                worker = self._workers.get(worker_id)
+                if worker is None or self._stopping.is_set():
+                    continue
+
+                try:
+                    message = worker["connection"].recv() if worker["connection"].poll() else None
+                except (EOFError, OSError):
+                    message = None
+                if message is None:
+                    if not worker["process"].is_alive():
+                        self._handle_exit(worker_id)
+                    continue
+
+                if message[0] == "ready":
+                    if message[1]:
+                        logger.error(f"Restarted inference worker {worker_id} failed to load: {message[1]}")
+                    else:
+                        worker["ready"] = True
+                else:
+                    _, job_id, index, summary = message
+                    with self._lock:
+                        worker["task"] = None
+                        self._record_result(job_id, index, summary)
+
+            self._assign_tasks()
+
+    def map(self, chunks: List[str], max_length: int, min_length: int) -> List[Optional[str]]:
+        """Summarize chunks across the workers, returning None for chunks that failed or timed out"""
+        if not chunks:
+            return []
+
+        job_id = next(self._job_ids)
+        job = _Job([None] * len(chunks))
+        with self._lock:
+            if self._broken:
+                raise RuntimeError(f"Inference pool unusable: {self._broken}")
+            self._jobs[job_id] = job
+            for index, chunk in enumerate(chunks):
+                self._pending.append((job_id, index, chunk, max_length, min_length))
+            self._wakeup_writer.send_bytes(b"")
+
+        if not job.done.wait(self.timeout):
+            logger.warning(f"Inference job {job_id} timed out with "
+                           f"{len(chunks) - len(job.finished)} chunks outstanding")
+
+        # Forgetting the job makes the dispatcher drop its remaining chunks
+        with self._lock:
+            del self._jobs[job_id]
+        return list(job.results)
+
+    def worker_pids(self) -> List[int]:
+        """Process ids of the current workers"""
+        return [worker["process"].pid for worker in list(self._workers.values())]
+
+    def close(self):
+        """Stop the dispatcher and the workers"""
+        self._stopping.set()
+        if self._dispatcher is not None:
+            with self._lock:
+                self._wakeup_writer.send_bytes(b"")
+            self._dispatcher.join(timeout=10)
+            self._dispatcher = None
+
+        for worker in self._workers.values():
+            try:
+                worker["connection"].send(None)
+            except (OSError, ValueError):
+                pass
+        for worker in self._workers.values():
+            worker["process"].join(timeout=10)
+            if worker["process"].is_alive():
+                worker["process"].terminate()
+            worker["connection"].close()
+        self._workers = {}
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
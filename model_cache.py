@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Model artifact cache for PDF Summarizer
+Pre-fetches models into a local versioned cache and loads them strictly offline.
+
+Cache layout:
+    MODEL_CACHE_DIR/<org>--<name>/<commit sha>/   model files + manifest.json
+    MODEL_CACHE_DIR/<org>--<name>/CURRENT         commit sha used for loading
+
+Usage:
+    python model_cache.py prefetch [model ...]
+    python model_cache.py verify [model ...]
+    python model_cache.py list
+    python model_cache.py report [model ...]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import config
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+CURRENT_NAME = "CURRENT"
+
+# Config, tokenizer and generation files needed next to the weights
+SUPPORT_PATTERNS = ["*.json", "*.txt", "*.model"]
+
+def default_models() -> List[str]:
+    """Models the application may load, in fallback order"""
+    models = [config.DEFAULT_MODEL] + list(config.FALLBACK_MODELS)
+    if config.ASSISTED_DECODING_ENABLED:
+        models.append(config.DRAFT_MODEL)
+    if config.SEMANTIC_SECTIONS_ENABLED:
+        models.append(config.EMBEDDING_MODEL)
+    return models
+
+def model_root(model_name: str) -> Path:
+    """Directory holding every cached version of a model"""
+    return Path(config.MODEL_CACHE_DIR) / model_name.replace("/", "--")
+
+def read_manifest(model_name: str) -> Optional[Dict]:
+    """Manifest of the current cached version, or None if the model is not cached"""
+    current_file = model_root(model_name) / CURRENT_NAME
+    if not current_file.exists():
+        return None
+
+    manifest_file = model_root(model_name) / current_file.read_text().strip() / MANIFEST_NAME
+    if not manifest_file.exists():
+        return None
+    return json.loads(manifest_file.read_text())
+
+def cached_model_path(model_name: str) -> Optional[Path]:
+    """Local directory of the current cached version, or None if the model is not cached"""
+    manifest = read_manifest(model_name)
+    if manifest is None:
+        return None
+    return model_root(model_name) / manifest["revision"]
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def prefetch_model(model_name: str, revision: str = "main") -> Path:
+    """Download a model into the versioned cache and record a checksum manifest"""
+    from huggingface_hub import HfApi, snapshot_download
+
+    info = HfApi().model_info(model_name, revision=revision)
+    filenames = [sibling.rfilename for sibling in info.siblings]
+
+    # Prefer safetensors so loading can memory-map the weights
+    if any(name.endswith(".safetensors") for name in filenames):
+        weights_format = "safetensors"
+        weights_patterns = ["*.safetensors"]
+    else:
+        weights_format = "pytorch"
+        weights_patterns = ["pytorch_model*.bin"]
+        logger.warning(f"{model_name} has no safetensors weights, caching PyTorch weights")
+
+    target = model_root(model_name) / info.sha
+    snapshot_download(
+        repo_id=model_name,
+        revision=info.sha,
+        local_dir=str(target),
+        allow_patterns=SUPPORT_PATTERNS + weights_patterns
+    )
+
+    files = {}
+    for path in sorted(target.rglob("*")):
+        relative = path.relative_to(target).as_posix()
+        if path.is_file() and relative != MANIFEST_NAME and not relative.startswith("."):
+            files[relative] = {"size": path.stat().st_size, "sha256": _sha256(path)}
+
+    manifest = {
+        "model": model_name,
+        "revision": info.sha,
+        "weights_format": weights_format,
+        "fetched_at": datetime.now().isoformat(timespec="seconds"),
+        "files": files
+    }
+    (target / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+    (model_root(model_name) / CURRENT_NAME).write_text(info.sha)
+
+    logger.info(f"Cached {model_name}@{info.sha[:10]} ({weights_format}) in {target}")
+    return target
+
+def verify_model(model_name: str, check_hashes: bool = True) -> List[str]:
+    """Compare cached files against the manifest, returning a list of problems"""
+    manifest = read_manifest(model_name)
+    if manifest is None:
+        return [f"{model_name} is not cached"]
+
+    path = model_root(model_name) / manifest["revision"]
+    problems = []
+    for relative, expected in manifest["files"].items():
+        file_path = path / relative
+        if not file_path.exists():
+            problems.append(f"missing {relative}")
+        elif file_path.stat().st_size != expected["size"]:
+            problems.append(f"size mismatch for {relative}")
+        elif check_hashes and _sha256(file_path) != expected["sha256"]:
+            problems.append(f"checksum mismatch for {relative}")
+    return problems
+
+def resolve_model_source(model_name: str) -> Tuple[str, Dict]:
+    """Where to load a model from, plus the from_pretrained() arguments to use.
+
+    Cached models load from local files only. Uncached models come from the
+    hub unless OFFLINE_MODE is set.
+    """
+    manifest = read_manifest(model_name)
+    if manifest is not None:
+        # A quick size check catches truncated downloads; full hashes run in `verify`
+        problems = verify_model(model_name, check_hashes=False)
+        if problems:
+            raise RuntimeError(f"Cached {model_name} is damaged: {', '.join(problems)}")
+
+        kwargs = {"local_files_only": True}
+        if manifest["weights_format"] == "safetensors":
+            kwargs["use_safetensors"] = True
+        return str(model_root(model_name) / manifest["revision"]), kwargs
+
+    if config.OFFLINE_MODE:
+        raise FileNotFoundError(
+            f"{model_name} is not in {config.MODEL_CACHE_DIR}; run `python model_cache.py prefetch` first"
+        )
+    return model_name, {}
+
+def load_model(model_name: str, device=None):
+    """Load tokenizer and seq2seq model, returning (tokenizer, model, load seconds)"""
+    from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+    start = time.perf_counter()
+    source, kwargs = resolve_model_source(model_name)
+    tokenizer = AutoTokenizer.from_pretrained(source, local_files_only=kwargs.get("local_files_only", False))
+    # low_cpu_mem_usage skips the random init copy, so safetensors weights
+    # are memory-mapped straight into the model
+    model = AutoModelForSeq2SeqLM.from_pretrained(source, low_cpu_mem_usage=True, **kwargs)
+    if device is not None:
+        model.to(device)
+    model.eval()
+    load_seconds = time.perf_counter() - start
+
+    logger.info(f"Loaded {model_name} from {source} in {load_seconds:.1f}s")
+    return tokenizer, model, load_seconds
+
+def load_with_fallback(model_names: List[str], device=None):
+    """Load the first model that works, returning (name, tokenizer, model, attempts).
+
+    attempts lists {"model", "seconds", "error"} for every model tried.
+    """
+    attempts = []
+    for model_name in model_names:
+        start = time.perf_counter()
+        try:
+            tokenizer, model, load_seconds = load_model(model_name, device)
+            attempts.append({"model": model_name, "seconds": load_seconds, "error": None})
+            return model_name, tokenizer, model, attempts
+        except Exception as e:
+            attempts.append({"model": model_name, "seconds": time.perf_counter() - start, "error": str(e)})
+            logger.warning(f"Failed to load {model_name}, trying next model: {str(e)}")
+
+    errors = "; ".join(f"{attempt['model']}: {attempt['error']}" for attempt in attempts)
+    raise RuntimeError(f"No summarization model could be loaded ({errors})")
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+def _load_report_child(model_name: str):
+    """Load one model in this process and print its load time and peak RSS as JSON"""
+    if model_name == config.EMBEDDING_MODEL:
+        from sentence_transformers import SentenceTransformer
+
+        start = time.perf_counter()
+        SentenceTransformer(resolve_model_source(model_name)[0], device="cpu")
+        load_seconds = time.perf_counter() - start
+    else:
+        _, _, load_seconds = load_model(model_name)
+    print(json.dumps({"model": model_name, "seconds": load_seconds, "peak_rss_mb": _peak_rss_mb()}))
+
+def load_report(model_names: List[str]) -> List[Dict]:
+    """Measure load time and peak RSS per model, each in a fresh process"""
+    results = []
+    for model_name in model_names:
+        completed = subprocess.run(
+            [sys.executable, __file__, "_load-child", model_name],
+            capture_output=True, text=True
+        )
+        if completed.returncode == 0:
+            results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+        else:
+            error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "unknown error"
+            results.append({"model": model_name, "error": error})
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the local model artifact cache")
+    parser.add_argument("command", choices=["prefetch", "verify", "list", "report", "_load-child"])
+    parser.add_argument("models", nargs="*", help="Model names (default: configured models)")
+    parser.add_argument("--revision", default="main", help="Hub revision to prefetch")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    models = args.models or default_models()
+
+    if args.command == "_load-child":
+        _load_report_child(models[0])
+        return
+
+    failed = False
+    if args.command == "prefetch":
+        for model_name in models:
+            try:
+                prefetch_model(model_name, args.revision)
+                problems = verify_model(model_name)
+                print(f"{'✅' if not problems else '❌'} {model_name} {', '.join(problems)}")
+                failed = failed or bool(problems)
+            except Exception as e:
+                print(f"❌ {model_name}: {str(e)}")
+                failed = True
+
+    elif args.command == "verify":
+        for model_name in models:
+            problems = verify_model(model_name)
+            print(f"{'✅' if not problems else '❌'} {model_name} {', '.join(problems)}")
+            failed = failed or bool(problems)
+
+    elif args.command == "list":
+        for model_name in models:
+            manifest = read_manifest(model_name)
+            if manifest is None:
+                print(f"  {model_name}: not cached")
+            else:
+                size_mb = sum(f["size"] for f in manifest["files"].values()) / (1024 * 1024)
+                print(f"  {model_name}: {manifest['revision'][:10]} {manifest['weights_format']} "
+                      f"{size_mb:,.0f} MB (fetched {manifest['fetched_at']})")
+
+    elif args.command == "report":
+        for result in load_report(models):
+            if "error" in result:
+                print(f"❌ {result['model']}: {result['error']}")
+                failed = True
+            else:
+                rss = f"{result['peak_rss_mb']:,.0f} MB" if result["peak_rss_mb"] is not None else "n/a"
+                print(f"✅ {result['model']}: loaded in {result['seconds']:.1f}s, peak RSS {rss}")
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Semantic sections for PDF Summarizer
+Embeds sentences in batches with an on-disk cache and clusters them into topical groups
+"""
+
+import hashlib
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from summarization import chunk_text
+from text_stats import top_terms, TERM_STRIP
+
+logger = logging.getLogger(__name__)
+
+PAGE_MARKER_RE = re.compile(r"--- Page \d+ ---")
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?][\"')\]])\s+|(?<=[.!?])\s+")
+MIN_SENTENCE_WORDS = 4
+
+def split_sentences(text: str) -> List[str]:
+    """Split extracted PDF text into sentences, dropping page markers.
+
+    Fragments shorter than MIN_SENTENCE_WORDS (headings, bullets) are joined
+    to the sentence that follows them, or to the last sentence at the end.
+    """
+    text = PAGE_MARKER_RE.sub(" ", text)
+    sentences, fragment = [], ""
+    for sentence in SENTENCE_SPLIT_RE.split(text):
+        sentence = " ".join(f"{fragment} {sentence}".split())
+        if len(sentence.split()) >= MIN_SENTENCE_WORDS:
+            sentences.append(sentence)
+            fragment = ""
+        else:
+            fragment = sentence
+
+    if fragment:
+        if sentences:
+            sentences[-1] = f"{sentences[-1]} {fragment}"
+        else:
+            sentences.append(fragment)
+    return sentences
+
+class EmbeddingCache:
+    """SQLite store of sentence embeddings keyed by a hash of model name and sentence"""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)")
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model_name: str, sentence: str) -> str:
+        return hashlib.sha256(f"{model_name}\0{sentence}".encode()).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                rows = self._connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+                for key, vector in rows:
+                    found[key] = np.frombuffer(vector, dtype=np.float32)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items.items()]
+            )
+            self._connection.commit()
+
+class SentenceEncoder:
+    """Batched sentence-transformers encoder backed by an EmbeddingCache"""
+
+    def __init__(self, model_name: str, cache: EmbeddingCache, batch_size: int = 64):
+        from sentence_transformers import SentenceTransformer
+        from model_cache import resolve_model_source
+
+        source, _ = resolve_model_source(model_name)
+        self.model = SentenceTransformer(source, device="cpu")
+        self.model_name = model_name
+        self.cache = cache
+        self.batch_size = batch_size
+
+    def encode(self, sentences: List[str]) -> Tuple[np.ndarray, Dict]:
+        """Unit-length embeddings for sentences, plus throughput and cache statistics"""
+        start = time.perf_counter()
+        keys = [EmbeddingCache.key(self.model_name, sentence) for sentence in sentences]
+        cached = self.cache.get_many(list(set(keys)))
+
+        # Encode each distinct uncached sentence once
+        missing = {}
+        for key, sentence in zip(keys, sentences):
+            if key not in cached:
+                missing[key] = sentence
+
+        if missing:
+            vectors = self.model.encode(
+                list(missing.values()),
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+            encoded = dict(zip(missing.keys(), vectors.astype(np.float32)))
+            self.cache.put_many(encoded)
+            cached.update(encoded)
+
+        embeddings = np.vstack([cached[key] for key in keys]) if keys else np.zeros((0, 0), dtype=np.float32)
+        elapsed = time.perf_counter() - start
+
+        stats = {
+            "sentences": len(sentences),
+            "encoded": len(missing),
+            "cache_hits": len(sentences) - sum(1 for key in keys if key in missing),
+            "seconds": round(elapsed, 3),
+        }
+        stats["cache_hit_rate"] = round(stats["cache_hits"] / len(sentences), 3) if sentences else 0.0
+        stats["sentences_per_second"] = round(len(sentences) / elapsed, 1) if elapsed else 0.0
+        return embeddings, stats
+
+def kmeans(embeddings: np.ndarray, k: int, iterations: int = 20, seed: int = 0) -> np.ndarray:
+    """Spherical k-means with k-means++ seeding, returning a cluster label per row"""
+    rng = np.random.default_rng(seed)
+    count = embeddings.shape[0]
+
+    seeds = [embeddings[rng.integers(count)]]
+    for _ in range(1, k):
+        distances = 1.0 - np.max(embeddings @ np.vstack(seeds).T, axis=1)
+        distances = np.clip(distances, 0.0, None)
+        total = distances.sum()
+        index = rng.choice(count, p=distances / total) if total > 0 else rng.integers(count)
+        seeds.append(embeddings[index])
+    centroids = np.vstack(seeds)
+
+    labels = np.zeros(count, dtype=np.int64)
+    for iteration in range(iterations):
+        new_labels = np.argmax(embeddings @ centroids.T, axis=1)
+        if iteration and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for cluster in range(k):
+            members = embeddings[labels == cluster]
+            if len(members):
+                centroid = members.sum(axis=0)
+                centroids[cluster] = centroid / (np.linalg.norm(centroid) or 1.0)
+    return labels
+
+def group_sentences(text: str, encoder: SentenceEncoder, max_chars: int = 3000,
+                    max_sections: int = 12) -> Tuple[List[Dict], Dict]:
+    """Cluster a document's sentences into topical sections.
+
+    Returns sections as {"title", "text"} in order of first appearance, plus
+    the embedding statistics. No section exceeds max_chars: sentences longer
+    than that are split by words first, and a group longer than that is split
+    into parts in document order.
+    """
+    # Unpunctuated PDF text can form sentences longer than one model call
+    sentences: List[str] = []
+    for sentence in split_sentences(text):
+        sentences.extend(chunk_text(sentence, max_length=max_chars) if len(sentence) > max_chars else [sentence])
+    embeddings, stats = encoder.encode(sentences)
+    if not sentences:
+        stats["sections"] = 0
+        return [], stats
+
+    # Enough groups that each fits one model call, but no more
+    total_chars = sum(len(sentence) + 1 for sentence in sentences)
+    k = max(1, min(max_sections, len(sentences), math.ceil(total_chars / max_chars)))
+    labels = kmeans(embeddings, k)
+
+    # (first sentence index, section) pairs, sorted into document order below
+    sections: List[Tuple[int, Dict[str, str]]] = []
+    for cluster in range(k):
+        members = np.flatnonzero(labels == cluster)
+        if not len(members):
+            continue
+
+        tokens = [word.strip(TERM_STRIP).lower() for index in members for word in sentences[index].split()]
+        title = ", ".join(term.capitalize() for term in top_terms(tokens, 3)) or f"Topic {cluster + 1}"
+
+        # Pack the group's sentences into parts of at most max_chars
+        parts: List[List[int]] = []
+        part: List[int] = []
+        length = 0
+        for index in members.tolist():
+            if length + len(sentences[index]) + 1 > max_chars and part:
+                parts.append(part)
+                part, length = [], 0
+            part.append(index)
+            length += len(sentences[index]) + 1
+        parts.append(part)
+
+        for number, part in enumerate(parts, 1):
+            sections.append((int(part[0]), {
+                "title": title if len(parts) == 1 else f"{title} (part {number})",
+                "text": " ".join(sentences[index] for index in part),
+            }))
+
+    sections.sort(key=lambda item: item[0])
+    stats["sections"] = len(sections)
+    return [section for _, section in sections], stats
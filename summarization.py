@@ -0,0 +1,209 @@
+"""
+Summarization helpers for PDF Summarizer
+Plain-Python text processing shared by the Streamlit app and the benchmark scripts
+"""
+
+import logging
+import PyPDF2
+from typing import Callable, Dict, List, Optional
+
+# summarize(text, max_length, min_length) -> summary text
+SummarizeFn = Callable[[str, int, int], str]
+# map_chunks(chunks, max_length, min_length) -> one summary per chunk, None where it failed
+MapChunksFn = Callable[[List[str], int, int], List[Optional[str]]]
+
+logger = logging.getLogger(__name__)
+
+def extract_text_from_pdf(pdf_file):
+    """Extract text from PDF file with better formatting"""
+    try:
+        pdf_reader = PyPDF2.PdfReader(pdf_file)
+        text = ""
+
+        for page_num, page in enumerate(pdf_reader.pages, 1):
+            page_text = page.extract_text()
+            if page_text.strip():
+                text += f"\n--- Page {page_num} ---\n{page_text}\n"
+
+        return text.strip()
+
+    except Exception as e:
+        logger.error(f"Error extracting text from PDF: {str(e)}")
+        return None
+
+def load_document(path) -> str:
+    """Read a PDF or plain text document from disk"""
+    if str(path).lower().endswith(".pdf"):
+        with open(path, "rb") as pdf_file:
+            return extract_text_from_pdf(pdf_file) or ""
+    with open(path, encoding="utf-8") as text_file:
+        return text_file.read()
+
+def chunk_text(text, max_length=1024):
+    """Split text into chunks suitable for summarization with better error handling"""
+    try:
+        words = text.split()
+        if len(words) == 0:
+            return []
+
+        chunks = []
+        current_chunk = []
+        current_length = 0
+
+        for word in words:
+            if current_length + len(word) + 1 <= max_length:
+                current_chunk.append(word)
+                current_length += len(word) + 1
+            else:
+                if current_chunk:
+                    chunks.append(" ".join(current_chunk))
+                current_chunk = [word]
+                current_length = len(word)
+
+        if current_chunk:
+            chunks.append(" ".join(current_chunk))
+
+        # Ensure we have at least one chunk
+        if not chunks:
+            chunks = [text[:max_length]]
+
+        return chunks
+
+    except Exception as e:
+        logger.error(f"Error in chunk_text: {str(e)}")
+        # Fallback: return the original text as a single chunk
+        return [text[:max_length]] if text else [""]
+
+def simple_fallback_summary(text: str) -> str:
+    """Simple fallback summarization when model fails"""
+    try:
+        sentences = text.split('. ')
+        if len(sentences) <= 3:
+            return text
+
+        # Take first few sentences and last sentence
+        summary_sentences = sentences[:3]
+        if len(sentences) > 4:
+            summary_sentences.append(sentences[-1])
+
+        return '. '.join(summary_sentences) + '.'
+    except:
+        return text[:500] + "..." if len(text) > 500 else text
+
+def compute_target_length(word_count: int) -> int:
+    """Determine target summary length (in tokens) based on document size"""
+    if word_count < 500:
+        target_length = max(50, int(word_count * 0.4))
+    elif word_count < 2000:
+        target_length = max(100, int(word_count * 0.3))
+    elif word_count < 5000:
+        target_length = max(200, int(word_count * 0.25))
+    else:
+        target_length = max(400, int(word_count * 0.2))
+
+    # Ensure target_length doesn't exceed input length
+    return min(target_length, word_count - 5)  # Leave some words for processing
+
+def map_chunks_sequential(summarize: SummarizeFn, chunks: List[str], max_length: int, min_length: int) -> List[Optional[str]]:
+    """Summarize chunks one after another in the current process"""
+    results: List[Optional[str]] = []
+    for chunk in chunks:
+        try:
+            results.append(summarize(chunk, max_length, min_length))
+        except Exception as e:
+            logger.warning(f"Chunk summarization failed: {str(e)}")
+            results.append(None)
+    return results
+
+def summarize_document(text: str, summarize: SummarizeFn, map_chunks: Optional[MapChunksFn] = None,
+                       word_count: Optional[int] = None, sections: Optional[List[Dict]] = None) -> Dict:
+    """Create a structured, comprehensive summary with sections.
+
+    Pass word_count when the document's statistics are already computed, and
+    sections ({"title", "text"} dicts) to summarize topical groups instead of
+    positional chunks. Summaries of those sections are returned under
+    "sections" unless they had to be condensed into a single final summary;
+    positional chunks only appear in the combined summary text.
+    """
+    try:
+        # Validate input text
+        if not text or len(text.strip()) < 50:
+            return {"error": "Text too short for summarization"}
+
+        # Calculate target summary length based on input text length
+        if word_count is None:
+            word_count = len(text.split())
+
+        if word_count < 20:
+            return {"error": "Document too short for summarization"}
+
+        # Determine target summary length based on document size
+        target_length = compute_target_length(word_count)
+
+        # Use the given sections, otherwise split text into positional chunks
+        if sections is not None and len(sections) > 1:
+            topical = True
+            labeled_chunks = [(section["title"], section["text"]) for section in sections]
+        else:
+            topical = False
+            chunks = chunk_text(text, max_length=1024)
+            labeled_chunks = [(f"Section {i+1}", chunk) for i, chunk in enumerate(chunks)]
+
+        if len(labeled_chunks) == 1:
+            # Single chunk - comprehensive summary
+            try:
+                summary = summarize(labeled_chunks[0][1], target_length, max(30, int(target_length * 0.3)))
+                return {"summary": summary}
+            except Exception as e:
+                # Fallback to simple summarization
+                logger.warning(f"Model failed, using fallback: {str(e)}")
+                fallback_summary = simple_fallback_summary(labeled_chunks[0][1])
+                return {"summary": fallback_summary}
+
+        else:
+            # Multiple chunks - map stage summarizes each comprehensively
+            chunk_target = max(50, int(target_length / len(labeled_chunks)))
+            labeled_chunks = [(title, chunk) for title, chunk in labeled_chunks if len(chunk.strip()) > 30]
+            section_texts = [chunk for _, chunk in labeled_chunks]
+
+            if map_chunks is None:
+                chunk_summaries = map_chunks_sequential(summarize, section_texts, chunk_target, max(20, int(chunk_target * 0.3)))
+            else:
+                try:
+                    chunk_summaries = map_chunks(section_texts, chunk_target, max(20, int(chunk_target * 0.3)))
+                except Exception as e:
+                    logger.warning(f"Parallel chunk summarization failed, summarizing in-process: {str(e)}")
+                    chunk_summaries = map_chunks_sequential(summarize, section_texts, chunk_target, max(20, int(chunk_target * 0.3)))
+
+            section_summaries = []
+            for (title, chunk), chunk_summary in zip(labeled_chunks, chunk_summaries):
+                if chunk_summary is None:
+                    # Fallback to simple summarization for this chunk
+                    chunk_summary = simple_fallback_summary(chunk)
+                section_summaries.append({"title": title, "summary": chunk_summary})
+
+            # Combine summaries
+            combined_summary = "\n\n".join(f"{section['title']}: {section['summary']}" for section in section_summaries)
+
+            # If combined summary is very long, create a final comprehensive summary
+            if len(combined_summary.split()) > target_length * 1.5:
+                try:
+                    final_summary = summarize(combined_summary, target_length, max(50, int(target_length * 0.5)))
+                    return {"summary": final_summary}
+                except Exception as e:
+                    # Fallback to simple summarization
+                    fallback_final = simple_fallback_summary(combined_summary)
+                    return {"summary": fallback_final}
+            elif topical:
+                return {"summary": combined_summary, "sections": section_summaries}
+            else:
+                return {"summary": combined_summary}
+
+    except Exception as e:
+        logger.error(f"Error in structured summarization: {str(e)}")
+        # Ultimate fallback
+        try:
+            fallback = simple_fallback_summary(text)
+            return {"summary": fallback}
+        except:
+            return {"error": f"Summarization failed: {str(e)}"}
@@ -0,0 +1,134 @@
+"""
+Text statistics for PDF Summarizer
+Single-pass document and summary metrics plus cheap summary quality signals
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Whitespace-delimited tokens, matching text.split() used for chunking
+TOKEN_RE = re.compile(r"\S+")
+# A token ending a sentence, allowing trailing quotes or brackets
+SENTENCE_END_RE = re.compile(r"[.!?][\"')\]]*$")
+PAGE_MARKER = "--- Page"
+TERM_STRIP = "\"'()[]{}<>.,;:!?*-–—"
+
+# Number of most frequent document terms the summary should cover
+TOP_TERMS = 20
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further had
+has have having he her here hers herself him himself his how i if in into is it its itself just
+may me might more most must my myself no nor not now of off on once only or other our ours
+ourselves out over own page same section shall she should so some such than that the their theirs
+them themselves then there these they this those through to too under until up upon very was we
+were what when where which while who whom why will with would you your yours yourself yourselves
+""".split())
+
+def _scan(text: str) -> Tuple[Dict, List[str]]:
+    """Walk the text once, returning its statistics and normalized tokens"""
+    normalized = []
+    token_lengths = []
+    sentence_lengths = []
+    paragraphs = 0
+    words_in_sentence = 0
+    previous_end = None
+
+    for match in TOKEN_RE.finditer(text):
+        token = match.group()
+
+        # A blank line between two tokens starts a new paragraph
+        if previous_end is None or text.count("\n", previous_end, match.start()) >= 2:
+            paragraphs += 1
+        previous_end = match.end()
+
+        normalized.append(token.strip(TERM_STRIP).lower())
+        token_lengths.append(len(token))
+        words_in_sentence += 1
+        if SENTENCE_END_RE.search(token):
+            sentence_lengths.append(words_in_sentence)
+            words_in_sentence = 0
+
+    if words_in_sentence:
+        sentence_lengths.append(words_in_sentence)
+
+    token_array = np.asarray(token_lengths, dtype=np.int32)
+    sentence_array = np.asarray(sentence_lengths, dtype=np.int32)
+
+    stats = {
+        "characters": len(text),
+        "words": int(token_array.size),
+        "sentences": int(sentence_array.size),
+        "paragraphs": paragraphs,
+        "pages": text.count(PAGE_MARKER),
+        "avg_word_length": round(float(token_array.mean()), 2) if token_array.size else 0.0,
+        "avg_sentence_length": round(float(sentence_array.mean()), 2) if sentence_array.size else 0.0,
+        "sentence_length_std": round(float(sentence_array.std()), 2) if sentence_array.size else 0.0,
+    }
+    return stats, normalized
+
+def _is_term(token: str) -> bool:
+    return len(token) > 2 and token.isalpha() and token not in STOPWORDS
+
+def top_terms(tokens: List[str], count: int = TOP_TERMS) -> List[str]:
+    """Most frequent content terms among normalized tokens"""
+    term_counts = Counter(token for token in tokens if _is_term(token))
+    return [term for term, _ in term_counts.most_common(count)]
+
+def trigram_redundancy(tokens: List[str]) -> float:
+    """Share of word trigrams that repeat an earlier trigram"""
+    if len(tokens) < 3:
+        return 0.0
+
+    vocabulary: Dict[str, int] = {}
+    ids = np.fromiter((vocabulary.setdefault(token, len(vocabulary)) for token in tokens),
+                      dtype=np.int64, count=len(tokens))
+    size = len(vocabulary)
+    # Encode each trigram as a single integer so np.unique can count them
+    codes = (ids[:-2] * size + ids[1:-1]) * size + ids[2:]
+    return round(1.0 - np.unique(codes).size / codes.size, 3)
+
+def compute_text_stats(text: str) -> Dict:
+    """Word, sentence, paragraph and page counts plus the document's top terms"""
+    stats, tokens = _scan(text)
+    stats["top_terms"] = top_terms(tokens)
+    return stats
+
+def quality_label(coverage: float, redundancy: float) -> str:
+    """Summary quality from term coverage and redundancy"""
+    if coverage >= 0.5 and redundancy <= 0.1:
+        return "High"
+    if coverage >= 0.3 and redundancy <= 0.25:
+        return "Medium"
+    return "Basic"
+
+def compute_summary_stats(summary: str, document_stats: Dict) -> Dict:
+    """Summary counts, compression ratio and quality signals against its document"""
+    stats, tokens = _scan(summary)
+
+    document_terms = document_stats["top_terms"]
+    summary_terms = set(token for token in tokens if _is_term(token))
+    if document_terms:
+        covered = np.isin(np.asarray(document_terms), np.asarray(sorted(summary_terms)))
+        coverage = round(float(covered.mean()), 3)
+    else:
+        coverage = 0.0
+
+    redundancy = trigram_redundancy(tokens)
+
+    if document_stats["characters"]:
+        compression_ratio = round((1 - stats["characters"] / document_stats["characters"]) * 100, 1)
+    else:
+        compression_ratio = 0.0
+
+    stats.update({
+        "compression_ratio": compression_ratio,
+        "coverage": coverage,
+        "redundancy": redundancy,
+        "quality": quality_label(coverage, redundancy),
+    })
+    return stats